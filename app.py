@@ -4,7 +4,8 @@ import numpy as np
 import matplotlib.pyplot as plt
 import os
 from src.monte_carlo import MonteCarloSimulator
-from src.data_ops import fetch_all_nba_data
+from src.team_store import DEFAULT_SEASON, available_seasons, master_data_path
+from src.slate import SlateArtifact, build_daily_slate, serve_match, slate_path_for
 
 st.set_page_config(page_title="NBA Monte Carlo Engine", layout="wide", page_icon="🏀")
 
@@ -42,7 +43,7 @@ with st.expander("ℹ️ Bu Sistem Nasıl Çalışır? (Metodoloji)"):
         * **Net Rating:** Takımın oyun dominasyonu güce eklenir.
 
         **3. Monte Carlo Simülasyonu:**
-        İki takımın gücü, hesaplanan volatilite ile **10.000 kez** sanal maçta çarpıştırılır.
+        İki takımın gücü, hesaplanan volatilite ile sanal maçta çarpıştırılır. Günün maçları her sabah **100.000 kez** önceden simüle edilir; özel senaryolar **10.000 kez** canlı oynatılır.
         """)
     with c2:
         st.image(
@@ -54,10 +55,16 @@ with st.sidebar:
     st.header("Kontrol Paneli")
     st.info("Kaynaklar: **B-Ref** & **ESPN**")
 
+    seasons = sorted(set(available_seasons()) | {DEFAULT_SEASON})
+    season = st.selectbox("Sezon", seasons, index=seasons.index(DEFAULT_SEASON), on_change=clear_cache)
+
     if st.button("🔄 Verileri Güncelle", type="secondary"):
         with st.spinner("Web siteleri taranıyor...(Biraz zaman alabilir)"):
             try:
-                fetch_all_nba_data()
+                # Selenium/BS4 yığını sadece güncelleme istendiğinde yüklenir
+                from src.data_ops import fetch_all_nba_data
+                if fetch_all_nba_data(season) is not None:
+                    build_daily_slate(season)
                 clear_cache()
                 st.success("Veri seti başarıyla yenilendi!")
             except Exception as e:
@@ -65,8 +72,8 @@ with st.sidebar:
 
     st.divider()
 
-    if os.path.exists("data/raw/nba_master_data_2026.csv"):
-        df_check = pd.read_csv("data/raw/nba_master_data_2026.csv")
+    if os.path.exists(master_data_path(season)):
+        df_check = pd.read_csv(master_data_path(season))
         st.success(f"{len(df_check)} Takım Hazır")
         with st.expander("Mevcut Takım Listesi"):
             teams_display = df_check['Team'].sort_values().reset_index(drop=True)
@@ -75,18 +82,28 @@ with st.sidebar:
     else:
         st.error("Veri dosyası bulunamadı! Lütfen güncelleyin.")
 
-if 'sim' not in st.session_state:
+if 'sim' not in st.session_state or st.session_state['sim'].season != season:
     try:
-        st.session_state['sim'] = MonteCarloSimulator()
+        st.session_state['sim'] = MonteCarloSimulator(season=season)
     except:
         pass
 
 if 'sim' in st.session_state:
     sim = st.session_state['sim']
-    sim.df = sim.load_data()
+    sim.reload()
     teams = sim.get_all_teams()
+    # Günlük artefakt: hazır senaryolar simülasyonsuz gelir
+    artifact = SlateArtifact.load(slate_path_for(sim.data_path, season), sim.data_path)
 else:
     teams = []
+    artifact = None
+
+if artifact is not None and artifact.matchups():
+    with st.sidebar:
+        st.divider()
+        st.caption(f"📅 Günün Maçları ({artifact.slate['date']})")
+        for h, a in artifact.matchups():
+            st.caption(f"{a} @ {h}")
 
 if teams:
     st.divider()
@@ -111,14 +128,15 @@ if teams:
         h_data = sim.get_team_stats(home_team)
         a_data = sim.get_team_stats(away_team)
 
-        h_stars = [s.strip() for s in str(h_data.get('Top_Stars', '')).split(',') if s.strip()]
-        a_stars = [s.strip() for s in str(a_data.get('Top_Stars', '')).split(',') if s.strip()]
+        h_roster = dict(sim.get_roster(home_team))
+        a_roster = dict(sim.get_roster(away_team))
 
         col_h, col_sep, col_a = st.columns([1, 0.1, 1])
 
         with col_h:
             st.markdown(f"**{home_team}**")
-            home_missing = st.multiselect("Eksik Oyuncular (-5 Puan)", h_stars, key="h_miss")
+            home_missing = st.multiselect("Eksik Oyuncular", list(h_roster), key="h_miss",
+                                          format_func=lambda p: f"{p} (-{h_roster[p]:.1f})")
 
             h_b2b_auto = h_data.get('Is_B2B', False)
             h_b2b_override = st.checkbox(f"Yorgunluk (B2B)? {'(Otomatik: Evet)' if h_b2b_auto else ''}",
@@ -126,7 +144,8 @@ if teams:
 
         with col_a:
             st.markdown(f"**{away_team}**")
-            away_missing = st.multiselect("Eksik Oyuncular (-5 Puan)", a_stars, key="a_miss")
+            away_missing = st.multiselect("Eksik Oyuncular", list(a_roster), key="a_miss",
+                                          format_func=lambda p: f"{p} (-{a_roster[p]:.1f})")
 
             a_b2b_auto = a_data.get('Is_B2B', False)
             a_b2b_override = st.checkbox(f"Yorgunluk (B2B)? {'(Otomatik: Evet)' if a_b2b_auto else ''}",
@@ -134,10 +153,10 @@ if teams:
 
     st.write("")
 
-    if st.button("10.000 MAÇI SİMÜLE ET", type="primary"):
+    if st.button("MAÇI SİMÜLE ET", type="primary"):
 
-        result = sim.simulate_match(
-            home_team, away_team,
+        result = serve_match(
+            sim, artifact, home_team, away_team, simulations=10000,
             override_home_b2b=h_b2b_override,
             override_away_b2b=a_b2b_override,
             home_missing_players=home_missing,
@@ -167,19 +186,18 @@ if teams:
                 f"<div style='text-align:center; padding:15px; background-color:#262730; border-radius:12px;'><h4 style='margin:0; color:#ddd;'>Beklenen Skor</h4><h1 style='margin:5px 0; color:white;'>{result['home_score']:.0f} - {result['away_score']:.0f}</h1><p style='margin:0; color:#888;'>Tahmini Toplam Sayı: <b>{result['total_score']:.1f}</b></p></div>",
                 unsafe_allow_html=True)
 
-            st.markdown("###Simülasyon Analizi")
-            sims = 10000
-            h_samples = np.random.normal(result['home_score'], 13.0, sims).round().astype(int)
-            a_samples = np.random.normal(result['away_score'], 13.0, sims).round().astype(int)
+            st.markdown("### Simülasyon Analizi")
+            dist = result['distribution']
+            source = "Hazır günlük tahmin" if result['source'] == 'artifact' else "Canlı simülasyon"
+            st.caption(f"{source} · {dist['simulations']:,} maç")
 
             tab1, tab2 = st.tabs(["En Olası Skorlar", "Fark Analizi"])
 
             with tab1:
-                scores = [f"{h}-{a}" for h, a in zip(h_samples, a_samples)]
-                score_counts = pd.Series(scores).value_counts().head(10)
+                score_counts = pd.Series({f"{h}-{a}": c for h, a, c in dist['top_scores']})
                 fig1, ax1 = plt.subplots(figsize=(10, 5))
                 plt.style.use('dark_background')
-                colors = ['#FFD700' if i == 0 else '#4CAF50' for i in range(10)]
+                colors = ['#FFD700' if i == 0 else '#4CAF50' for i in range(len(score_counts))]
                 bars = ax1.barh(score_counts.index, score_counts.values, color=colors)
                 ax1.invert_yaxis()
                 ax1.bar_label(bars, padding=3, color='white', fontsize=10)
@@ -188,13 +206,13 @@ if teams:
                 st.pyplot(fig1)
 
             with tab2:
-                margins = h_samples - a_samples
+                margins = np.arange(dist['margin_min'], dist['margin_min'] + len(dist['margin_counts']))
                 bins = [-float('inf'), -10.5, -5.5, -0.5, 0.5, 5.5, 10.5, float('inf')]
                 labels = [f"{away_team} Farklı (11+)", f"{away_team} Orta (6-10)", f"{away_team} Yakın (1-5)",
                           "Uzatma İhtimali", f"{home_team} Yakın (1-5)", f"{home_team} Orta (6-10)",
                           f"{home_team} Farklı (11+)"]
                 cats = pd.cut(margins, bins=bins, labels=labels)
-                cat_counts = cats.value_counts().sort_index()
+                cat_counts = pd.Series(dist['margin_counts']).groupby(cats, observed=False).sum()
                 fig2, ax2 = plt.subplots(figsize=(10, 5))
                 bar_colors = ['#FF5252'] * 3 + ['gray'] + ['#4CAF50'] * 3
                 bars2 = ax2.bar(cat_counts.index, cat_counts.values, color=bar_colors)
@@ -208,8 +226,8 @@ if teams:
             st.subheader("Neden Bu Sonuç?")
             d = result['details']
 
-            h_miss_pen = d['h_missing_count'] * -5.0
-            a_miss_pen = d['a_missing_count'] * -5.0
+            h_miss_pen = d['h_injury']
+            a_miss_pen = d['a_injury']
 
             analysis_data = {
                 "Analiz Faktörü": ["Saha Avantajı", "Ağırlıklı Form", "Stil Eşleşmesi", "Net Rating Bonusu",
@@ -0,0 +1,46 @@
+import os
+import subprocess
+import sys
+import time
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SCENARIOS = {
+    "pandas (dashboard yolu)": (
+        "from src.monte_carlo import MonteCarloSimulator\n"
+        "sim = MonteCarloSimulator()\n"
+        "t = sim.get_all_teams(); sim.simulate_match(t[0], t[1])"
+    ),
+    "csv (hafif CLI yolu)": (
+        "from src.monte_carlo import MonteCarloSimulator\n"
+        "sim = MonteCarloSimulator(use_pandas=False)\n"
+        "t = sim.get_all_teams(); sim.simulate_match(t[0], t[1])"
+    ),
+    "scraper import (eski app.py)": "import pandas\nfrom src.data_ops import fetch_all_nba_data",
+}
+
+
+def time_scenario(code, repeats):
+    runs = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        proc = subprocess.run([sys.executable, "-c", code], cwd=BASE_DIR, capture_output=True, text=True)
+        runs.append(time.perf_counter() - start)
+        if proc.returncode != 0:
+            return None, proc.stderr.strip().splitlines()[-1]
+    return min(runs), None
+
+
+def main(repeats=5):
+    print(f"{'Senaryo':<32}{'En iyi süre (ms)':>18}")
+    print("-" * 50)
+    for name, code in SCENARIOS.items():
+        best, err = time_scenario(code, repeats)
+        if best is None:
+            print(f"{name:<32}{'atlandı':>18}  ({err})")
+        else:
+            print(f"{name:<32}{best * 1000:>18.1f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5)
@@ -8,12 +8,12 @@ def main():
     print("=" * 50)
 
     try:
-        sim = MonteCarloSimulator()
+        sim = MonteCarloSimulator(use_pandas=False)
     except Exception as e:
         print(f"Hata: {e}")
         return
 
-    teams = sorted(sim.df['Team'].unique())
+    teams = sim.get_all_teams()
 
     while True:
         print("\n--- NE YAPMAK İSTERSİNİZ? ---")
@@ -52,4 +52,7 @@ def main():
 
 
 if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        from src.cli import main as cli_main
+        sys.exit(cli_main())
     main()
\ No newline at end of file
@@ -0,0 +1,370 @@
+import argparse
+import csv
+import datetime
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from src.lines import LINE_SIMULATIONS, LineTable, build_line_table, lines_path_for
+from src.monte_carlo import MonteCarloSimulator
+from src.slate import (SLATE_SIMULATIONS, SlateArtifact, build_daily_slate, read_fixtures, serve_match,
+                       slate_path_for)
+from src.team_store import DEFAULT_SEASON
+
+EXIT_OK = 0
+EXIT_ERROR = 1
+EXIT_USAGE = 2
+EXIT_UNKNOWN_TEAM = 3
+
+DEFAULT_SIMULATIONS = 10000
+DEFAULT_CHUNK_SIZE = 1_000_000
+
+RESULT_FIELDS = ['home_team', 'away_team', 'home_win_pct', 'away_win_pct',
+                 'home_score', 'away_score', 'total_score']
+
+_worker_sim = None
+
+
+def build_simulator(args):
+    for label, path in (('snapshot', args.snapshot), ('store', args.store), ('data file', args.data)):
+        if path and not os.path.exists(path):
+            raise FileNotFoundError(f"{label} not found: {path}")
+    return MonteCarloSimulator(data_path=args.data, snapshot_path=args.snapshot, use_pandas=False,
+                               season=args.season, store_path=args.store, as_of=args.as_of)
+
+
+def missing_data_message(args):
+    refresh_hint = f"run `python main.py refresh --season {args.season}` first"
+    if not args.store:
+        return f"no team data for season {args.season}, {refresh_hint}"
+
+    from src.season_store import SeasonStore
+    first = SeasonStore.load(args.store).first_date(args.season)
+    if first is None:
+        return f"season {args.season} is not in {args.store}, {refresh_hint} or run `python -m src.season_store`"
+    return f"no snapshot for season {args.season} on or before {args.as_of} (first snapshot: {first.isoformat()})"
+
+
+def _init_worker(loader_kwargs):
+    global _worker_sim
+    _worker_sim = MonteCarloSimulator(**loader_kwargs)
+
+
+def _simulate_game(job):
+    return _run_game(_worker_sim, *job)
+
+
+def _run_game(sim, game, sims, seed_seq, chunk_size=None, float32=False):
+    kwargs = dict(
+        override_home_b2b=game.get('home_b2b'),
+        override_away_b2b=game.get('away_b2b'),
+        home_missing_players=game.get('home_missing'),
+        away_missing_players=game.get('away_missing'),
+        rng=np.random.default_rng(seed_seq)
+    )
+    if chunk_size is None:
+        return sim.simulate_match(game['home'], game['away'], simulations=sims, **kwargs)
+
+    result = sim.simulate_match_streaming(game['home'], game['away'], simulations=sims, chunk_size=chunk_size,
+                                          dtype=np.float32 if float32 else np.float64, **kwargs)
+    # The aggregate holds the full histograms; only the summary leaves the process
+    if result is not None:
+        result.pop('aggregate', None)
+    return result
+
+
+def run_games(sim, games, args):
+    # Each game gets its own child seed, so results do not depend on --workers
+    seeds = np.random.SeedSequence(args.seed).spawn(len(games))
+    jobs = [(g, args.sims, s, args.chunk_size, args.float32) for g, s in zip(games, seeds)]
+
+    if args.workers > 1 and len(games) > 1:
+        chunksize = max(1, len(jobs) // (args.workers * 4))
+        with ProcessPoolExecutor(max_workers=args.workers, initializer=_init_worker,
+                                 initargs=(sim.loader_kwargs(),)) as pool:
+            return list(pool.map(_simulate_game, jobs, chunksize=chunksize))
+
+    return [_run_game(sim, *job) for job in jobs]
+
+
+def check_teams(sim, games):
+    known = set(sim.get_all_teams())
+    unknown = sorted({t for g in games for t in (g['home'], g['away']) if t not in known})
+    if unknown:
+        print(f"error: unknown team(s): {', '.join(unknown)}", file=sys.stderr)
+        print("       run `python main.py teams` for the list of valid names", file=sys.stderr)
+        return False
+    return True
+
+
+def _flatten(result):
+    return {k: result[k] for k in RESULT_FIELDS}
+
+
+def write_results(results, fmt, out=None, single=False):
+    out = out or sys.stdout
+    if fmt == 'csv':
+        writer = csv.DictWriter(out, fieldnames=RESULT_FIELDS, lineterminator='\n')
+        writer.writeheader()
+        for r in results:
+            writer.writerow(_flatten(r))
+    else:
+        payload = results[0] if single else [_flatten(r) for r in results]
+        json.dump(payload, out, indent=2, default=_json_default)
+        out.write('\n')
+
+
+def _json_default(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def _parse_b2b(value):
+    if value is None: return None
+    return value.lower() in ('1', 'true', 'yes', 'y')
+
+
+def _parse_date(value):
+    try:
+        return datetime.date.fromisoformat(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected a date as YYYY-MM-DD, got {value!r}")
+
+
+def cmd_predict(sim, args):
+    game = {
+        'home': args.home, 'away': args.away,
+        'home_b2b': _parse_b2b(args.home_b2b), 'away_b2b': _parse_b2b(args.away_b2b),
+        'home_missing': args.home_missing, 'away_missing': args.away_missing,
+    }
+    if not check_teams(sim, [game]): return EXIT_UNKNOWN_TEAM
+
+    # Serve from the daily slate artifact only for a default run that matches a precomputed scenario;
+    # an explicit --sims or --seed always gets the simulation it asked for
+    cacheable = not (args.live or args.explicit_run or args.chunk_size or args.snapshot or args.store)
+    rng = np.random.default_rng(np.random.SeedSequence(args.seed).spawn(1)[0])
+    payload = serve_match(sim, load_artifact(sim) if cacheable else None, args.home, args.away, args.sims, rng,
+                          chunk_size=args.chunk_size or DEFAULT_CHUNK_SIZE, dtype=np.float32 if args.float32 else np.float64,
+                          override_home_b2b=game['home_b2b'], override_away_b2b=game['away_b2b'],
+                          home_missing_players=args.home_missing, away_missing_players=args.away_missing)
+    write_results([payload], args.format, single=True)
+    return EXIT_OK
+
+
+def load_artifact(sim):
+    return SlateArtifact.load(slate_path_for(sim.data_path, sim.season), sim.data_path)
+
+
+def cmd_slate(sim, args):
+    if args.build:
+        if args.fixtures and not os.path.exists(args.fixtures):
+            print(f"error: fixtures file not found: {args.fixtures}", file=sys.stderr)
+            return EXIT_ERROR
+        try:
+            build_daily_slate(sim.season, data_path=sim.data_path, fixtures_path=args.fixtures,
+                              simulations=args.sims, seed=args.seed)
+        except ValueError as e:
+            print(f"error: {e}", file=sys.stderr)
+            return EXIT_ERROR
+    artifact = load_artifact(sim)
+    if artifact is None:
+        print("error: no up-to-date slate artifact, run `python main.py slate --build`", file=sys.stderr)
+        return EXIT_ERROR
+    results = [artifact.lookup(sim, h, a) for h, a in artifact.matchups()]
+    write_results([r for r in results if r is not None], args.format)
+    return EXIT_OK
+
+
+def cmd_matrix(sim, args):
+    teams = sim.get_all_teams()
+    games = [{'home': h, 'away': a} for h in teams for a in teams if h != a]
+    write_results(run_games(sim, games, args), args.format)
+    return EXIT_OK
+
+
+def cmd_fixtures(sim, args):
+    try:
+        games = [{'home': h, 'away': a} for h, a in read_fixtures(args.file)]
+    except (OSError, ValueError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return EXIT_ERROR
+    if not check_teams(sim, games): return EXIT_UNKNOWN_TEAM
+    write_results(run_games(sim, games, args), args.format)
+    return EXIT_OK
+
+
+def cmd_lines(sim, args):
+    table_path = args.table or lines_path_for(sim.data_path, sim.season)
+    game = {'home': args.home, 'away': args.away}
+    if not check_teams(sim, [game]): return EXIT_UNKNOWN_TEAM
+
+    if args.build:
+        print(f"building line table ({args.sims} sims per game)...", file=sys.stderr)
+        build_line_table(sim, table_path, simulations=args.sims, seed=args.seed)
+    if not os.path.exists(table_path):
+        print(f"error: line table not found: {table_path} (use --build)", file=sys.stderr)
+        return EXIT_ERROR
+
+    table = LineTable.load(table_path)
+    if (args.home, args.away) not in table:
+        print(f"error: {args.home} vs {args.away} not in {table_path} (use --build)", file=sys.stderr)
+        return EXIT_ERROR
+
+    spreads = args.spread if args.spread else table.margin_lines.tolist()
+    totals = args.total if args.total else table.total_lines.tolist()
+    rows = [{'market': 'spread', 'line': x, 'prob_over': float(p), 'prob_push': float(q)}
+            for x, p, q in zip(spreads, table.prob_margin_over(args.home, args.away, spreads),
+                               table.prob_margin_push(args.home, args.away, spreads))]
+    rows += [{'market': 'total', 'line': y, 'prob_over': float(p), 'prob_push': float(q)}
+             for y, p, q in zip(totals, table.prob_total_over(args.home, args.away, totals),
+                                table.prob_total_push(args.home, args.away, totals))]
+
+    if args.format == 'csv':
+        writer = csv.DictWriter(sys.stdout, fieldnames=['market', 'line', 'prob_over', 'prob_push'], lineterminator='\n')
+        writer.writeheader()
+        writer.writerows(rows)
+    else:
+        json.dump({'home_team': args.home, 'away_team': args.away, 'table_created': table.created,
+                   'lines': rows}, sys.stdout, indent=2)
+        sys.stdout.write('\n')
+    return EXIT_OK
+
+
+def cmd_roster(sim, args):
+    if not check_teams(sim, [{'home': args.team, 'away': args.team}]): return EXIT_UNKNOWN_TEAM
+    rows = [{'player': p, 'impact': round(float(i), 2)} for p, i in sim.get_roster(args.team)]
+    if args.format == 'csv':
+        writer = csv.DictWriter(sys.stdout, fieldnames=['player', 'impact'], lineterminator='\n')
+        writer.writeheader()
+        writer.writerows(rows)
+    else:
+        json.dump({'team': args.team, 'players': rows}, sys.stdout, indent=2)
+        sys.stdout.write('\n')
+    return EXIT_OK
+
+
+def cmd_teams(sim, args):
+    for team in sim.get_all_teams():
+        print(team)
+    return EXIT_OK
+
+
+def cmd_refresh(args):
+    from src.data_ops import fetch_all_nba_data
+    if fetch_all_nba_data(args.season) is None:
+        return EXIT_ERROR
+    build_daily_slate(args.season)
+    return EXIT_OK
+
+
+def build_parser():
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('--sims', type=int, default=None,
+                        help=f"simulations per game (default: {DEFAULT_SIMULATIONS}; "
+                             f"slate --build: {SLATE_SIMULATIONS}; lines --build: {LINE_SIMULATIONS})")
+    common.add_argument('--seed', type=int, default=None, help="random seed for reproducible runs")
+    common.add_argument('--workers', type=int, default=1, help="worker processes for multi-game runs")
+    common.add_argument('--season', type=int, default=DEFAULT_SEASON,
+                        help=f"season (end year) to load (default: {DEFAULT_SEASON})")
+    common.add_argument('--data', default=None, help="master data CSV (default: data/raw/nba_master_data_<season>.csv)")
+    common.add_argument('--snapshot', default=None, help="load teams from a .npz snapshot instead of the CSV")
+    common.add_argument('--store', default=None, help="load teams from the multi-season store (.npz)")
+    common.add_argument('--as-of', type=_parse_date, default=None, metavar='YYYY-MM-DD',
+                        help="with --store: use the latest team snapshot on or before this date "
+                             "(player injury impacts always come from the latest nba_players_<season>.npz)")
+    common.add_argument('--format', choices=['json', 'csv'], default='json', help="output format")
+    common.add_argument('--chunk-size', type=int, default=None,
+                        help="stream samples in chunks of this size (constant memory for huge --sims); "
+                             f"predict always streams (default chunk: {DEFAULT_CHUNK_SIZE})")
+    common.add_argument('--float32', action='store_true',
+                        help="draw streamed chunks in float32 (predict; matrix/fixtures need --chunk-size)")
+
+    parser = argparse.ArgumentParser(prog='main.py', description="NBA Monte Carlo simulation engine")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    p = sub.add_parser('predict', parents=[common], help="simulate a single game")
+    p.add_argument('home')
+    p.add_argument('away')
+    p.add_argument('--home-b2b', metavar='BOOL', default=None, help="override home back-to-back flag")
+    p.add_argument('--away-b2b', metavar='BOOL', default=None, help="override away back-to-back flag")
+    p.add_argument('--home-missing', metavar='PLAYER', nargs='*', default=None, help="missing home players")
+    p.add_argument('--away-missing', metavar='PLAYER', nargs='*', default=None, help="missing away players")
+    p.add_argument('--live', action='store_true', help="always simulate, even if the slate artifact has the game")
+    p.set_defaults(handler=cmd_predict)
+
+    p = sub.add_parser('slate', parents=[common], help="today's precomputed predictions from the slate artifact")
+    p.add_argument('--build', action='store_true', help="rebuild the artifact from the fixtures file first")
+    p.add_argument('--fixtures', default=None,
+                   help="fixtures CSV with Date,Home,Away (default: data/raw/nba_fixtures_<season>.csv)")
+    p.set_defaults(handler=cmd_slate)
+
+    p = sub.add_parser('matrix', parents=[common], help="simulate every home/away pairing")
+    p.set_defaults(handler=cmd_matrix)
+
+    p = sub.add_parser('fixtures', parents=[common], help="simulate games listed in a CSV with Home,Away columns")
+    p.add_argument('file')
+    p.set_defaults(handler=cmd_fixtures)
+
+    p = sub.add_parser('lines', parents=[common],
+                       help="P(margin > x) / P(total > y) from the precomputed line table")
+    p.add_argument('home')
+    p.add_argument('away')
+    p.add_argument('--spread', type=float, nargs='*', default=None, help="home margin lines (default: all)")
+    p.add_argument('--total', type=float, nargs='*', default=None, help="total points lines (default: all)")
+    p.add_argument('--table', default=None, help="line table path (default: data/raw/nba_lines_<season>.npz)")
+    p.add_argument('--build', action='store_true', help="recompute the table for every pairing first")
+    p.set_defaults(handler=cmd_lines)
+
+    p = sub.add_parser('roster', parents=[common], help="list a team's players and their injury impact")
+    p.add_argument('team')
+    p.set_defaults(handler=cmd_roster)
+
+    p = sub.add_parser('teams', parents=[common], help="list valid team names")
+    p.set_defaults(handler=cmd_teams)
+
+    p = sub.add_parser('refresh', help="scrape fresh data (needs Chrome + selenium)")
+    p.add_argument('--season', type=int, default=DEFAULT_SEASON, help=f"season to scrape (default: {DEFAULT_SEASON})")
+    p.set_defaults(handler=None)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+
+    if args.command == 'refresh':
+        return cmd_refresh(args)
+
+    # predict only answers from the slate artifact when neither --sims nor --seed was given
+    args.explicit_run = args.sims is not None or args.seed is not None
+    if args.sims is None:
+        args.sims = {'slate': SLATE_SIMULATIONS, 'lines': LINE_SIMULATIONS}.get(args.command, DEFAULT_SIMULATIONS)
+
+    if args.sims < 1 or args.workers < 1 or (args.chunk_size is not None and args.chunk_size < 1):
+        print("error: --sims, --workers and --chunk-size must be positive", file=sys.stderr)
+        return EXIT_USAGE
+
+    # matrix/fixtures only stream with --chunk-size; predict always streams
+    if args.float32 and args.chunk_size is None and args.command in ('matrix', 'fixtures'):
+        print("error: --float32 needs --chunk-size", file=sys.stderr)
+        return EXIT_USAGE
+
+    try:
+        sim = build_simulator(args)
+    except (OSError, KeyError, ValueError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return EXIT_ERROR
+
+    if not sim.get_all_teams():
+        print(f"error: {missing_data_message(args)}", file=sys.stderr)
+        return EXIT_ERROR
+
+    return args.handler(sim, args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
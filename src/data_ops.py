@@ -9,8 +9,14 @@ from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from webdriver_manager.chrome import ChromeDriverManager
 from selenium.webdriver.chrome.options import Options
+from src.team_store import DEFAULT_SEASON, build_snapshot, current_season, master_data_path
+from src.season_store import append_season_snapshot
+from src.player_store import PlayerStore, players_path_for
+from src.slate import fixtures_path_for
+from src.lines import build_line_table, lines_path_for
+from src.monte_carlo import MonteCarloSimulator
 
-SEASON = 2026
+SEASON = DEFAULT_SEASON
 
 SLUG_MAP = {
     "atl": "Atlanta Hawks", "bos": "Boston Celtics", "bkn": "Brooklyn Nets",
@@ -89,45 +95,82 @@ def extract_table_literal(html_content, table_id):
     return None
 
 
-def scrape_top_scorers(driver):
-    print("3/4: Yıldız Oyuncular Tespit Ediliyor...")
-    url = f"https://www.basketball-reference.com/leagues/NBA_{SEASON}_per_game.html"
+BREF_TEAM_MAP = {
+    "ATL": "Atlanta Hawks", "BOS": "Boston Celtics", "BRK": "Brooklyn Nets", "CHI": "Chicago Bulls",
+    "CHO": "Charlotte Hornets", "CLE": "Cleveland Cavaliers", "DAL": "Dallas Mavericks", "DEN": "Denver Nuggets",
+    "DET": "Detroit Pistons", "GSW": "Golden State Warriors", "HOU": "Houston Rockets", "IND": "Indiana Pacers",
+    "LAC": "Los Angeles Clippers", "LAL": "Los Angeles Lakers", "MEM": "Memphis Grizzlies", "MIA": "Miami Heat",
+    "MIL": "Milwaukee Bucks", "MIN": "Minnesota Timberwolves", "NOP": "New Orleans Pelicans",
+    "NYK": "New York Knicks",
+    "OKC": "Oklahoma City Thunder", "ORL": "Orlando Magic", "PHI": "Philadelphia 76ers", "PHO": "Phoenix Suns",
+    "POR": "Portland Trail Blazers", "SAC": "Sacramento Kings", "SAS": "San Antonio Spurs",
+    "TOR": "Toronto Raptors",
+    "UTA": "Utah Jazz", "WAS": "Washington Wizards"
+}
+
+
+def _read_player_table(driver, url, table_ids):
     driver.get(url)
     time.sleep(3)
-
     html = driver.page_source
-    tbl = extract_table_literal(html, 'per_game_stats')
-    if not tbl:
+    for table_id in table_ids:
+        tbl = extract_table_literal(html, table_id)
+        if tbl:
+            df = pd.read_html(io.StringIO(tbl))[0]
+            if isinstance(df.columns, pd.MultiIndex): df.columns = df.columns.droplevel(0)
+            df = df.loc[:, ~df.columns.duplicated()]
+            if 'Tm' in df.columns and 'Team' not in df.columns: df = df.rename(columns={'Tm': 'Team'})
+            return df[df['Player'] != 'Player']
+    return pd.DataFrame()
+
+
+def scrape_player_stats(driver, season=SEASON):
+    print("3/4: Oyuncu Etki Tablosu Hazırlanıyor...")
+    df = _read_player_table(driver, f"https://www.basketball-reference.com/leagues/NBA_{season}_per_game.html",
+                            ['per_game_stats'])
+    if df.empty:
         print("UYARI: Oyuncu istatistikleri çekilemedi.")
         return pd.DataFrame()
 
-    df = pd.read_html(io.StringIO(tbl))[0]
-    df = df[df['Player'] != 'Player']
+    # Rk aynı oyuncunun (takas edilmiş olsa bile) tüm satırlarında aynıdır; yoksa isim kullanılır
+    df['Player_Key'] = df['Rk'] if 'Rk' in df.columns else df['Player']
+    df = df[['Player_Key', 'Player', 'Team', 'MP', 'PTS']].copy()
+    df['MP'] = pd.to_numeric(df['MP'], errors='coerce')
     df['PTS'] = pd.to_numeric(df['PTS'], errors='coerce')
 
-    BREF_TEAM_MAP = {
-        "ATL": "Atlanta Hawks", "BOS": "Boston Celtics", "BRK": "Brooklyn Nets", "CHI": "Chicago Bulls",
-        "CHO": "Charlotte Hornets", "CLE": "Cleveland Cavaliers", "DAL": "Dallas Mavericks", "DEN": "Denver Nuggets",
-        "DET": "Detroit Pistons", "GSW": "Golden State Warriors", "HOU": "Houston Rockets", "IND": "Indiana Pacers",
-        "LAC": "Los Angeles Clippers", "LAL": "Los Angeles Lakers", "MEM": "Memphis Grizzlies", "MIA": "Miami Heat",
-        "MIL": "Milwaukee Bucks", "MIN": "Minnesota Timberwolves", "NOP": "New Orleans Pelicans",
-        "NYK": "New York Knicks",
-        "OKC": "Oklahoma City Thunder", "ORL": "Orlando Magic", "PHI": "Philadelphia 76ers", "PHO": "Phoenix Suns",
-        "POR": "Portland Trail Blazers", "SAC": "Sacramento Kings", "SAS": "San Antonio Spurs",
-        "TOR": "Toronto Raptors",
-        "UTA": "Utah Jazz", "WAS": "Washington Wizards"
-    }
+    df_usg = _read_player_table(driver, f"https://www.basketball-reference.com/leagues/NBA_{season}_advanced.html",
+                                ['advanced', 'advanced_stats'])
+    if not df_usg.empty and 'USG%' in df_usg.columns:
+        df_usg = df_usg[['Player', 'Team', 'USG%']].drop_duplicates(subset=['Player', 'Team'])
+        df = pd.merge(df, df_usg, on=['Player', 'Team'], how='left')
+    else:
+        print("UYARI: Kullanım oranları (USG%) çekilemedi, etki sadece sayı ve süreden hesaplanacak.")
+        df['USG%'] = float('nan')
+    df['USG%'] = pd.to_numeric(df['USG%'], errors='coerce')
+
+    # Takas edilen oyuncuların "2TM/TOT" toplam satırları atılır; B-Ref takım satırlarını sırayla
+    # listelediği için sadece son (güncel) takım satırı kalır
+    df['Team'] = df['Team'].map(BREF_TEAM_MAP)
+    df = df.dropna(subset=['Team']).drop_duplicates(subset=['Player_Key'], keep='last')
+    df = df.drop(columns=['Player_Key'])
+    print(f"   -> {len(df)} oyuncu, {df['Team'].nunique()} takım.")
+    return df.reset_index(drop=True)
 
-    star_list = []
-    for abbr, full_name in BREF_TEAM_MAP.items():
-        team_players = df[df['Team'] == abbr].sort_values('PTS', ascending=False).head(2)
-        if not team_players.empty:
-            stars = ", ".join(team_players['Player'].tolist())
-            star_list.append({'Team': full_name, 'Top_Stars': stars})
 
+def top_scorers(df_players, n=2):
+    star_list = []
+    for team, grp in df_players.groupby('Team'):
+        stars = ", ".join(grp.sort_values('PTS', ascending=False).head(n)['Player'].tolist())
+        star_list.append({'Team': team, 'Top_Stars': stars})
     return pd.DataFrame(star_list)
 
 
+def build_player_store(df_players, path):
+    store = PlayerStore(df_players['Team'].to_numpy(), df_players['Player'].to_numpy(),
+                        df_players['MP'].to_numpy(), df_players['PTS'].to_numpy(), df_players['USG%'].to_numpy())
+    return store.save(path)
+
+
 def scrape_fatigue(driver):
     print("4/4: Fikstür ve Yorgunluk Analizi...")
     yesterday = datetime.datetime.now() - datetime.timedelta(days=1)
@@ -160,14 +203,39 @@ def scrape_fatigue(driver):
     return df_fatigue
 
 
-def fetch_all_nba_data():
+def scrape_todays_fixtures(driver, season=SEASON):
+    print("Günün Fikstürü Çekiliyor...")
+    today = datetime.date.today()
+    month = today.strftime('%B').lower()
+    driver.get(f"https://www.basketball-reference.com/leagues/NBA_{season}_games-{month}.html")
+    time.sleep(2)
+
+    tbl = extract_table_literal(driver.page_source, 'schedule')
+    if not tbl:
+        print("UYARI: Fikstür tablosu bulunamadı.")
+        return pd.DataFrame(columns=['Date', 'Home', 'Away'])
+
+    df = pd.read_html(io.StringIO(tbl))[0]
+    df = df[df['Date'] != 'Date']
+    df['Date'] = pd.to_datetime(df['Date'], format='%a, %b %d, %Y', errors='coerce').dt.date
+    df = df[df['Date'] == today]
+
+    fixtures = pd.DataFrame({
+        'Date': [d.isoformat() for d in df['Date']],
+        'Home': df['Home/Neutral'].map(clean_bref_name).tolist(),
+        'Away': df['Visitor/Neutral'].map(clean_bref_name).tolist(),
+    })
+    print(f"   -> Bugün {len(fixtures)} maç var.")
+    return fixtures
+
+
+def fetch_all_nba_data(season=SEASON):
     driver = get_driver()
-    base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-    output_dir = os.path.join(base_dir, 'data', 'raw')
-    os.makedirs(output_dir, exist_ok=True)
+    output_file = master_data_path(season)
+    os.makedirs(os.path.dirname(output_file), exist_ok=True)
 
     try:
-        url_adv = f"https://www.basketball-reference.com/leagues/NBA_{SEASON}.html"
+        url_adv = f"https://www.basketball-reference.com/leagues/NBA_{season}.html"
         print(f"1/4: Güç ve Volatilite Verileri (B-Ref) Çekiliyor...")
         driver.get(url_adv)
         time.sleep(3)
@@ -240,7 +308,7 @@ def fetch_all_nba_data():
         print(f"   -> B-Ref Tamam: {len(df_adv)} takım.")
 
         print(f"2/4: Form Verileri (ESPN) Çekiliyor...")
-        driver.get("https://www.espn.com/nba/standings")
+        driver.get(f"https://www.espn.com/nba/standings/_/season/{season}")
         time.sleep(3)
         espn_source = driver.page_source
 
@@ -287,8 +355,13 @@ def fetch_all_nba_data():
         df_espn = pd.DataFrame(clean_espn).drop_duplicates(subset=['Team'])
         print(f"   -> ESPN Form Hazır: {len(df_espn)} takım.")
 
-        df_stars = scrape_top_scorers(driver)
-        df_fatigue = scrape_fatigue(driver)
+        df_players = scrape_player_stats(driver, season)
+        df_stars = top_scorers(df_players) if not df_players.empty else pd.DataFrame()
+        # B2B sadece güncel sezon için anlamlı (dünün maçları)
+        in_season = season == current_season()
+        df_fatigue = scrape_fatigue(driver) if in_season else pd.DataFrame()
+        df_fixtures = scrape_todays_fixtures(driver, season) if in_season else pd.DataFrame(
+            columns=['Date', 'Home', 'Away'])
 
         print("Veriler Birleştiriliyor...")
         final_df = pd.merge(df_adv, df_espn, on='Team', how='inner')
@@ -304,8 +377,16 @@ def fetch_all_nba_data():
             final_df['Is_B2B'] = False
 
         final_df = final_df.sort_values('Team')
-        output_file = os.path.join(output_dir, f'nba_master_data_{SEASON}.csv')
         final_df.to_csv(output_file, index=False)
+        df_fixtures.to_csv(fixtures_path_for(output_file, season), index=False)
+        build_snapshot(output_file)
+        append_season_snapshot(season, output_file)
+        if not df_players.empty:
+            build_player_store(df_players, players_path_for(output_file, season))
+
+        print("Spread/Total eğrileri hesaplanıyor...")
+        sim = MonteCarloSimulator(data_path=output_file, use_pandas=False, season=season)
+        build_line_table(sim, lines_path_for(output_file, season), seed=season)
 
         print("-" * 50)
         print(f"BAŞARILI: {len(final_df)} takımın GELİŞMİŞ verisi hazır.")
@@ -327,4 +408,5 @@ def fetch_all_nba_data():
 
 
 if __name__ == "__main__":
-    fetch_all_nba_data()
\ No newline at end of file
+    import sys
+    fetch_all_nba_data(int(sys.argv[1]) if len(sys.argv) > 1 else SEASON)
\ No newline at end of file
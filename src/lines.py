@@ -0,0 +1,129 @@
+import datetime
+import os
+
+import numpy as np
+
+from src.streaming import half_point, stream_normal_pairs
+
+TABLE_VERSION = 1
+MARGIN_LINES = np.arange(-50.5, 51.0, 1.0)
+TOTAL_LINES = np.arange(170.5, 311.0, 1.0)
+PROB_SCALE = 65535
+LINE_SIMULATIONS = 100_000
+
+
+def lines_path_for(csv_path, season):
+    return os.path.join(os.path.dirname(csv_path), f'nba_lines_{season}.npz')
+
+
+def _quantize(p):
+    return np.rint(np.clip(p, 0.0, 1.0) * PROB_SCALE).astype(np.uint16)
+
+
+class LineTable:
+    # P(home margin > x) ve P(total > y) eğrileri; her satır bir (ev, deplasman) eşleşmesi
+    def __init__(self, home, away, margin_lines, total_lines, margin_sf, total_sf,
+                 home_score, away_score, simulations, created):
+        self.home = np.asarray(home)
+        self.away = np.asarray(away)
+        self.margin_lines = np.asarray(margin_lines, dtype=np.float32)
+        self.total_lines = np.asarray(total_lines, dtype=np.float32)
+        self.margin_sf = np.asarray(margin_sf)
+        self.total_sf = np.asarray(total_sf)
+        self.home_score = np.asarray(home_score, dtype=np.float32)
+        self.away_score = np.asarray(away_score, dtype=np.float32)
+        self.simulations = int(simulations)
+        self.created = str(created)
+        self.index = {(h, a): i for i, (h, a) in enumerate(zip(self.home.tolist(), self.away.tolist()))}
+
+    def __len__(self):
+        return len(self.index)
+
+    def __contains__(self, game):
+        return tuple(game) in self.index
+
+    def row(self, home_team, away_team):
+        i = self.index.get((home_team, away_team))
+        if i is None:
+            raise KeyError(f"{home_team} vs {away_team} not in line table")
+        return i
+
+    # Curves are stored on half-point lines; any line x is answered as strict P(X > x) from the
+    # half-point line floor(x) + 0.5, and integer lines expose the push P(X == x) separately.
+    def _sf(self, grid, sf, lines):
+        return np.interp(half_point(np.asarray(lines, dtype=np.float64)), grid, sf / PROB_SCALE)
+
+    def _push(self, grid, sf, lines):
+        lines = np.asarray(lines, dtype=np.float64)
+        push = self._sf(grid, sf, lines - 1.0) - self._sf(grid, sf, lines)
+        return np.where(lines == np.floor(lines), push, 0.0)
+
+    def prob_margin_over(self, home_team, away_team, lines):
+        i = self.row(home_team, away_team)
+        return self._sf(self.margin_lines, self.margin_sf[i], lines)
+
+    def prob_margin_push(self, home_team, away_team, lines):
+        i = self.row(home_team, away_team)
+        return self._push(self.margin_lines, self.margin_sf[i], lines)
+
+    def prob_total_over(self, home_team, away_team, lines):
+        i = self.row(home_team, away_team)
+        return self._sf(self.total_lines, self.total_sf[i], lines)
+
+    def prob_total_push(self, home_team, away_team, lines):
+        i = self.row(home_team, away_team)
+        return self._push(self.total_lines, self.total_sf[i], lines)
+
+    def save(self, path):
+        np.savez_compressed(
+            path, version=np.array(TABLE_VERSION), home=self.home, away=self.away,
+            margin_lines=self.margin_lines, total_lines=self.total_lines,
+            margin_sf=self.margin_sf, total_sf=self.total_sf,
+            home_score=self.home_score, away_score=self.away_score,
+            simulations=np.array(self.simulations), created=np.array(self.created)
+        )
+        return path
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as z:
+            if int(z['version']) != TABLE_VERSION:
+                raise ValueError(f"{path}: unsupported line table version {int(z['version'])}")
+            return cls(z['home'], z['away'], z['margin_lines'], z['total_lines'], z['margin_sf'],
+                       z['total_sf'], z['home_score'], z['away_score'], int(z['simulations']),
+                       str(z['created']))
+
+
+def compute_line_surface(sim, games=None, simulations=LINE_SIMULATIONS, chunk_size=1_000_000, seed=None,
+                         margin_lines=MARGIN_LINES, total_lines=TOTAL_LINES):
+    if games is None:
+        teams = sim.get_all_teams()
+        games = [(h, a) for h in teams for a in teams if h != a]
+
+    margin_lines = np.asarray(margin_lines, dtype=np.float64)
+    total_lines = np.asarray(total_lines, dtype=np.float64)
+    margin_sf = np.zeros((len(games), margin_lines.size), dtype=np.uint16)
+    total_sf = np.zeros((len(games), total_lines.size), dtype=np.uint16)
+    home_score = np.zeros(len(games))
+    away_score = np.zeros(len(games))
+    seeds = np.random.SeedSequence(seed).spawn(len(games))
+
+    for i, ((home, away), ss) in enumerate(zip(games, seeds)):
+        params = sim.match_params(home, away)
+        if params is None:
+            raise KeyError(f"unknown team in {home} vs {away}")
+        agg = stream_normal_pairs(params['home_score'], params['away_score'], params['volatility'],
+                                  simulations, chunk_size=chunk_size, dtype=np.float32,
+                                  rng=np.random.default_rng(ss))
+        margin_sf[i] = _quantize(agg.margin_survival(margin_lines))
+        total_sf[i] = _quantize(agg.total_survival(total_lines))
+        home_score[i] = params['home_score']
+        away_score[i] = params['away_score']
+
+    return LineTable([g[0] for g in games], [g[1] for g in games], margin_lines, total_lines,
+                     margin_sf, total_sf, home_score, away_score, simulations,
+                     datetime.date.today().isoformat())
+
+
+def build_line_table(sim, path, **kwargs):
+    return compute_line_surface(sim, **kwargs).save(path)
@@ -1,22 +1,53 @@
-import pandas as pd
 import numpy as np
 import os
+from src.team_store import DEFAULT_SEASON, load_team_records, load_snapshot, master_data_path
+from src.streaming import stream_normal_pairs
+from src.player_store import FALLBACK_PENALTY, PlayerStore, injury_penalty, players_path_for
 
 
 class MonteCarloSimulator:
-    def __init__(self):
-        base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        self.data_path = os.path.join(base_dir, 'data', 'raw', 'nba_master_data_2026.csv')
-        self.df = self.load_data()
-
-        if not self.df.empty:
-            self.league_avg_efg = self.df['Off_eFG'].mean()
-            self.league_avg_tov = self.df['Off_TOV'].mean()
+    def __init__(self, data_path=None, snapshot_path=None, use_pandas=True, season=DEFAULT_SEASON,
+                 store_path=None, as_of=None):
+        self.season = season
+        self.data_path = data_path or master_data_path(season)
+        self.snapshot_path = snapshot_path
+        # Çok sezonlu depodan (season, tarih) snapshot'ı okunur
+        self.store_path = store_path
+        self.as_of = as_of
+        # pandas sadece dashboard için gerekli; CLI csv/snapshot yolundan hızlı açılır
+        self.use_pandas = use_pandas and snapshot_path is None and store_path is None
+        self.df = None
+        self.reload()
+
+    def loader_kwargs(self):
+        return {'data_path': self.data_path, 'snapshot_path': self.snapshot_path, 'use_pandas': False,
+                'season': self.season, 'store_path': self.store_path, 'as_of': self.as_of}
+
+    def reload(self):
+        if self.use_pandas:
+            self.df = self.load_data()
+            records = self.df.to_dict('records') if not self.df.empty else []
+        elif self.store_path:
+            from src.season_store import SeasonStore
+            records = SeasonStore.load(self.store_path).season_records(self.season, self.as_of)
+        elif self.snapshot_path:
+            records = load_snapshot(self.snapshot_path)
+        else:
+            records = load_team_records(self.data_path)
+
+        self.teams = {r['Team']: r for r in records}
+        # Oyuncu tablosu tarihli tutulmuyor: --as-of ile de güncel etki değerleri kullanılır
+        self.players = PlayerStore.load(players_path_for(self.data_path, self.season))
+
+        if self.teams:
+            self.league_avg_efg = float(np.nanmean([float(r['Off_eFG']) for r in records]))
+            self.league_avg_tov = float(np.nanmean([float(r['Off_TOV']) for r in records]))
         else:
             self.league_avg_efg = 0.54
             self.league_avg_tov = 13.0
 
     def load_data(self):
+        import pandas as pd
         if not os.path.exists(self.data_path): return pd.DataFrame()
         df = pd.read_csv(self.data_path)
         if 'Team' in df.columns:
@@ -41,13 +72,18 @@ class MonteCarloSimulator:
         return df
 
     def get_team_stats(self, team_name):
-        if self.df.empty: return None
-        match = self.df[self.df['Team'] == team_name]
-        return match.iloc[0] if not match.empty else None
+        return self.teams.get(team_name)
 
     def get_all_teams(self):
-        if self.df.empty: return []
-        return sorted(self.df['Team'].unique().tolist())
+        return sorted(self.teams)
+
+    def get_roster(self, team_name):
+        # (oyuncu, etki) listesi; oyuncu tablosu yoksa CSV'deki Top_Stars sabit cezayla döner
+        if self.players is not None and team_name in self.players.teams:
+            return self.players.roster(team_name)
+        stats = self.get_team_stats(team_name) or {}
+        stars = [s.strip() for s in str(stats.get('Top_Stars', '') or '').split(',') if s.strip()]
+        return [(s, FALLBACK_PENALTY) for s in stars]
 
     def parse_record(self, record):
         try:
@@ -111,9 +147,9 @@ class MonteCarloSimulator:
 
         return bonus
 
-    def simulate_match(self, home_team, away_team, simulations=10000,
-                       override_home_b2b=None, override_away_b2b=None,
-                       home_missing_players=None, away_missing_players=None):
+    def match_params(self, home_team, away_team,
+                     override_home_b2b=None, override_away_b2b=None,
+                     home_missing_players=None, away_missing_players=None):
 
         h = self.get_team_stats(home_team)
         a = self.get_team_stats(away_team)
@@ -137,8 +173,8 @@ class MonteCarloSimulator:
         h_missing_count = len(home_missing_players) if home_missing_players else 0
         a_missing_count = len(away_missing_players) if away_missing_players else 0
 
-        h_injury_pen = h_missing_count * -5.0
-        a_injury_pen = a_missing_count * -5.0
+        h_injury_pen = -injury_penalty(self.players, h['Team'], home_missing_players)
+        a_injury_pen = -injury_penalty(self.players, a['Team'], away_missing_players)
 
         h_net_bonus = float(h.get('Net_Rtg', 0.0)) * 0.3
         a_net_bonus = float(a.get('Net_Rtg', 0.0)) * 0.3
@@ -159,16 +195,10 @@ class MonteCarloSimulator:
         a_vol = self.calculate_volatility(a)
         match_volatility = (h_vol + a_vol) / 2
 
-        h_sim = np.random.normal(h_score_exp, match_volatility, simulations)
-        a_sim = np.random.normal(a_score_exp, match_volatility, simulations)
-
-        win_prob = (np.sum(h_sim > a_sim) / simulations) * 100
-
         return {
             'home_team': h['Team'],
             'away_team': a['Team'],
-            'home_win_pct': win_prob,
-            'away_win_pct': 100 - win_prob,
+            'volatility': match_volatility,
             'home_score': h_score_exp,
             'away_score': a_score_exp,
             'total_score': h_score_exp + a_score_exp,
@@ -184,7 +214,51 @@ class MonteCarloSimulator:
                 'a_fatigue': a_fatigue_pen,
                 'h_missing_count': h_missing_count,
                 'a_missing_count': a_missing_count,
+                'h_injury': h_injury_pen,
+                'a_injury': a_injury_pen,
                 'h_net_bonus': h_net_bonus,
                 'a_net_bonus': a_net_bonus
             }
-        }
\ No newline at end of file
+        }
+
+    def simulate_match(self, home_team, away_team, simulations=10000,
+                       override_home_b2b=None, override_away_b2b=None,
+                       home_missing_players=None, away_missing_players=None, rng=None):
+
+        params = self.match_params(home_team, away_team, override_home_b2b, override_away_b2b,
+                                   home_missing_players, away_missing_players)
+        if params is None: return None
+
+        rng = rng if rng is not None else np.random
+        h_sim = rng.normal(params['home_score'], params['volatility'], simulations)
+        a_sim = rng.normal(params['away_score'], params['volatility'], simulations)
+
+        win_prob = (np.sum(h_sim > a_sim) / simulations) * 100
+
+        return self._with_win_pct(params, win_prob)
+
+    def simulate_match_streaming(self, home_team, away_team, simulations=10_000_000, chunk_size=1_000_000,
+                                 dtype=np.float64, override_home_b2b=None, override_away_b2b=None,
+                                 home_missing_players=None, away_missing_players=None, rng=None):
+        # Bellek kullanımı simulations'tan bağımsız: her chunk toplanıp atılır
+        params = self.match_params(home_team, away_team, override_home_b2b, override_away_b2b,
+                                   home_missing_players, away_missing_players)
+        if params is None: return None
+
+        agg = stream_normal_pairs(params['home_score'], params['away_score'], params['volatility'],
+                                  simulations, chunk_size=chunk_size, dtype=dtype, rng=rng)
+
+        result = self._with_win_pct(params, agg.home_win_pct)
+        result['distribution'] = agg.summary()
+        result['aggregate'] = agg
+        return result
+
+    def _with_win_pct(self, params, win_prob):
+        result = {
+            'home_team': params['home_team'],
+            'away_team': params['away_team'],
+            'home_win_pct': win_prob,
+            'away_win_pct': 100 - win_prob,
+        }
+        result.update({k: v for k, v in params.items() if k not in result})
+        return result
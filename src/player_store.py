@@ -0,0 +1,87 @@
+import os
+
+import numpy as np
+
+STORE_VERSION = 1
+# ~30 sayı / 36 dk / %32 kullanım yapan bir yıldız eski sabit cezaya (5.0) denk gelir
+IMPACT_SCALE = 0.14
+IMPACT_CAP = 8.0
+LEAGUE_AVG_USG = 20.0
+FALLBACK_PENALTY = 5.0
+
+
+def players_path_for(csv_path, season):
+    return os.path.join(os.path.dirname(csv_path), f'nba_players_{season}.npz')
+
+
+def compute_player_impact(pts, mp, usg):
+    pts = np.nan_to_num(np.asarray(pts, dtype=np.float64))
+    mp = np.nan_to_num(np.asarray(mp, dtype=np.float64))
+    usg = np.asarray(usg, dtype=np.float64)
+    usg_factor = np.where(np.isnan(usg), 1.0, usg / LEAGUE_AVG_USG)
+    return np.clip(IMPACT_SCALE * pts * (mp / 48.0) * usg_factor, 0.0, IMPACT_CAP)
+
+
+class PlayerStore:
+    # Takım bazında sıralı oyuncu tablosu: (team, player) -> satır, team -> [start, stop)
+    def __init__(self, team, player, mp, pts, usg, impact=None):
+        team = np.asarray(team).astype(str)
+        player = np.asarray(player).astype(str)
+        mp = np.asarray(mp, dtype=np.float32)
+        pts = np.asarray(pts, dtype=np.float32)
+        usg = np.asarray(usg, dtype=np.float32)
+        impact = compute_player_impact(pts, mp, usg) if impact is None else np.asarray(impact)
+
+        order = np.lexsort((-impact, team))
+        self.team = team[order]
+        self.player = player[order]
+        self.mp = mp[order]
+        self.pts = pts[order]
+        self.usg = usg[order]
+        self.impact = impact[order].astype(np.float32)
+
+        self.rows = {(t, p): i for i, (t, p) in enumerate(zip(self.team.tolist(), self.player.tolist()))}
+        self.teams = {}
+        for i, t in enumerate(self.team.tolist()):
+            start, _ = self.teams.get(t, (i, i))
+            self.teams[t] = (start, i + 1)
+
+    def __len__(self):
+        return len(self.player)
+
+    def roster(self, team):
+        start, stop = self.teams.get(team, (0, 0))
+        return list(zip(self.player[start:stop].tolist(), self.impact[start:stop].tolist()))
+
+    def top_players(self, team, n=2):
+        return [p for p, _ in self.roster(team)[:n]]
+
+    def player_impact(self, team, player):
+        i = self.rows.get((team, player))
+        return float(self.impact[i]) if i is not None else FALLBACK_PENALTY
+
+    def injury_penalty(self, team, players):
+        if not players: return 0.0
+        rows = np.fromiter((self.rows.get((team, p), -1) for p in players), dtype=np.int64, count=len(players))
+        known = rows >= 0
+        # Tabloda olmayan isimler için eski sabit ceza
+        return float(self.impact[rows[known]].sum()) + FALLBACK_PENALTY * int((~known).sum())
+
+    def save(self, path):
+        np.savez_compressed(path, version=np.array(STORE_VERSION), team=self.team, player=self.player,
+                            mp=self.mp, pts=self.pts, usg=self.usg, impact=self.impact)
+        return path
+
+    @classmethod
+    def load(cls, path):
+        if not os.path.exists(path): return None
+        with np.load(path, allow_pickle=False) as z:
+            if int(z['version']) != STORE_VERSION:
+                raise ValueError(f"{path}: unsupported player store version {int(z['version'])}")
+            return cls(z['team'], z['player'], z['mp'], z['pts'], z['usg'], z['impact'])
+
+
+def injury_penalty(store, team, players):
+    if store is None:
+        return FALLBACK_PENALTY * len(players) if players else 0.0
+    return store.injury_penalty(team, players)
@@ -0,0 +1,181 @@
+import datetime
+import os
+import sys
+
+import numpy as np
+
+from src.team_store import (BOOL_COLUMNS, DATA_DIR, TEXT_COLUMNS, available_seasons, clean_records,
+                            load_team_records, master_data_path)
+
+STORE_VERSION = 1
+STORE_PATH = os.path.join(DATA_DIR, 'nba_multi_season.npz')
+KEY_COLUMNS = ['season', 'date', 'Team']
+
+
+def _to_day(date):
+    if date is None:
+        date = datetime.date.today()
+    return np.datetime64(date, 'D')
+
+
+def season_end(season):
+    return datetime.date(int(season), 6, 30)
+
+
+def snapshot_date(season, date=None):
+    # Geçmiş bir sezonun verisi bugün çekilse bile o sezonun sonuna tarihlenir
+    day = _to_day(date)
+    return min(day, np.datetime64(season_end(season), 'D'))
+
+
+class SeasonStore:
+    # Tüm sezonların günlük takım snapshot'ları tek tabloda; (season, Team, date) sırasıyla indeksli
+    def __init__(self, columns=None):
+        self.columns = columns or {
+            'season': np.zeros(0, dtype=np.int16),
+            'date': np.zeros(0, dtype='datetime64[D]'),
+            'Team': np.zeros(0, dtype=str),
+        }
+        self._build_index()
+
+    def __len__(self):
+        return len(self.columns['season'])
+
+    def _build_index(self):
+        season = self.columns['season']
+        team = self.columns['Team']
+        date = self.columns['date']
+        order = np.lexsort((date, team, season))
+        if len(order) and not np.array_equal(order, np.arange(len(order))):
+            self.columns = {k: v[order] for k, v in self.columns.items()}
+            season, team, date = self.columns['season'], self.columns['Team'], self.columns['date']
+
+        # (season, team) -> [start, stop) satır aralığı
+        n = len(season)
+        if n:
+            change = np.flatnonzero((season[1:] != season[:-1]) | (team[1:] != team[:-1])) + 1
+            starts = np.concatenate(([0], change))
+            stops = np.concatenate((change, [n]))
+            self.index = {(int(season[s]), str(team[s])): (int(s), int(e)) for s, e in zip(starts, stops)}
+        else:
+            self.index = {}
+
+    def seasons(self):
+        return sorted({s for s, _ in self.index})
+
+    def dates(self, season=None):
+        mask = self.columns['season'] == season if season is not None else slice(None)
+        return np.unique(self.columns['date'][mask])
+
+    def first_date(self, season):
+        dates = self.dates(season)
+        return dates[0].item() if len(dates) else None
+
+    def add(self, season, records, date=None):
+        records = clean_records(records)
+        if not records: return self
+        day = snapshot_date(season, date)
+        n = len(records)
+
+        new = {'season': np.full(n, season, dtype=np.int16), 'date': np.full(n, day),
+               'Team': np.array([r['Team'] for r in records])}
+        for col in sorted({c for r in records for c in r} - set(KEY_COLUMNS)):
+            new[col] = _column_array(col, [r.get(col) for r in records])
+
+        # Aynı (season, Team, date) varsa yeni gelen kazanır
+        keep = np.ones(len(self), dtype=bool)
+        if len(self):
+            same_day = (self.columns['season'] == season) & (self.columns['date'] == day)
+            keep &= ~(same_day & np.isin(self.columns['Team'], new['Team']))
+
+        old_n = int(keep.sum())
+        merged = {}
+        for col in set(self.columns) | set(new):
+            old = self.columns[col][keep] if col in self.columns else _empty_column(col, new[col], old_n)
+            add = new[col] if col in new else _empty_column(col, old, n)
+            merged[col] = np.concatenate((old, add))
+
+        self.columns = merged
+        self._build_index()
+        return self
+
+    def lookup(self, season, team, date=None):
+        span = self.index.get((int(season), team))
+        if span is None: return None
+        start, stop = span
+        if date is None:
+            i = stop - 1
+        else:
+            i = start + int(np.searchsorted(self.columns['date'][start:stop], _to_day(date), side='right')) - 1
+            if i < start: return None
+        return self._record(i)
+
+    def season_records(self, season, date=None):
+        records = [self.lookup(season, team, date) for (s, team) in self.index if s == int(season)]
+        return [r for r in records if r is not None]
+
+    def _record(self, i):
+        return {col: arr[i].item() for col, arr in self.columns.items()}
+
+    def to_frame(self):
+        import pandas as pd
+        return pd.DataFrame(self.columns)
+
+    def save(self, path=STORE_PATH):
+        names = np.array(sorted(self.columns))
+        np.savez_compressed(path, _version=np.array(STORE_VERSION), _columns=names, **self.columns)
+        return path
+
+    @classmethod
+    def load(cls, path=STORE_PATH):
+        if not os.path.exists(path): return cls()
+        with np.load(path, allow_pickle=False) as z:
+            if int(z['_version']) != STORE_VERSION:
+                raise ValueError(f"{path}: unsupported store version {int(z['_version'])}")
+            columns = {name: z[name] for name in z['_columns'].tolist()}
+        return cls(columns)
+
+
+def _to_float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def _column_array(col, values):
+    if col in BOOL_COLUMNS:
+        return np.array([bool(v) for v in values], dtype=bool)
+    if col in TEXT_COLUMNS:
+        return np.array(["" if v is None else str(v) for v in values])
+    # Sayısal kolondaki tek bir bozuk hücre tüm geçmişi metne çevirmesin: okunamayan değer NaN olur
+    return np.array([_to_float(v) for v in values], dtype=np.float64)
+
+
+def _empty_column(col, like, n):
+    if like.dtype.kind == 'b': return np.zeros(n, dtype=bool)
+    if like.dtype.kind in 'US': return np.full(n, "", dtype=like.dtype)
+    return np.full(n, np.nan, dtype=np.float64)
+
+
+def append_season_snapshot(season, csv_path=None, date=None, path=STORE_PATH):
+    store = SeasonStore.load(path)
+    store.add(season, load_team_records(csv_path or master_data_path(season)), date)
+    return store.save(path)
+
+
+def build_store(seasons=None, path=STORE_PATH):
+    # Mevcut sezon CSV'lerini tek dosyada topla; tarih olarak CSV'nin son değişiklik günü kullanılır
+    # (geçmiş sezonlarda sezon sonuna çekilir)
+    store = SeasonStore.load(path)
+    for season in seasons or available_seasons():
+        csv_path = master_data_path(season)
+        if not os.path.exists(csv_path): continue
+        day = datetime.date.fromtimestamp(os.path.getmtime(csv_path))
+        store.add(season, load_team_records(csv_path), day)
+    return store.save(path)
+
+
+if __name__ == "__main__":
+    seasons = [int(s) for s in sys.argv[1:]] or None
+    print(f"Çok sezonlu veri deposu yazıldı: {build_store(seasons)}")
@@ -0,0 +1,193 @@
+import csv
+import datetime
+import gzip
+import hashlib
+import json
+import os
+import sys
+
+import numpy as np
+
+from src.team_store import DEFAULT_SEASON, master_data_path
+
+SLATE_VERSION = 1
+SLATE_SIMULATIONS = 100_000
+TOP_SCORES = 10
+
+
+def fixtures_path_for(csv_path, season):
+    return os.path.join(os.path.dirname(csv_path), f'nba_fixtures_{season}.csv')
+
+
+def slate_path_for(csv_path, season):
+    return os.path.join(os.path.dirname(csv_path), f'nba_slate_{season}.json.gz')
+
+
+def file_sha1(path):
+    if not path or not os.path.exists(path): return None
+    with open(path, 'rb') as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+def read_fixtures(path, date=None):
+    # Home/Away kolonları zorunlu; date verilirse Date kolonu olan satırlardan sadece o günün maçları
+    day = date.isoformat() if date is not None else None
+    with open(path, newline='', encoding='utf-8') as f:
+        reader = csv.DictReader(f)
+        columns = {c.strip().lower(): c for c in (reader.fieldnames or [])}
+        if 'home' not in columns or 'away' not in columns:
+            raise ValueError(f"{path}: fixtures file needs 'Home' and 'Away' columns")
+
+        games = []
+        for row in reader:
+            row_date = (row[columns['date']] or '').strip() if 'date' in columns else ''
+            if day and row_date and row_date != day: continue
+            home = (row[columns['home']] or '').strip()
+            away = (row[columns['away']] or '').strip()
+            if home and away:
+                games.append((home, away))
+    return games
+
+
+def scenario_key(home_b2b, away_b2b, home_missing=None, away_missing=None):
+    return json.dumps([bool(home_b2b), bool(away_b2b), sorted(home_missing or []), sorted(away_missing or [])])
+
+
+def result_payload(result, top_k=TOP_SCORES):
+    # simulate_match_streaming çıktısını JSON'a uygun, grafiklerin ihtiyaç duyduğu özetle döndürür
+    agg = result['aggregate']
+    nonzero = np.flatnonzero(agg.margin_hist)
+    lo, hi = (int(nonzero[0]), int(nonzero[-1]) + 1) if nonzero.size else (0, 0)
+    payload = {k: v for k, v in result.items() if k not in ('aggregate', 'distribution')}
+    payload['home_win_pct'] = float(result['home_win_pct'])
+    payload['away_win_pct'] = float(result['away_win_pct'])
+    payload['details'] = {k: (v.item() if isinstance(v, np.generic) else v) for k, v in result['details'].items()}
+    payload['distribution'] = {
+        'simulations': agg.n,
+        'top_scores': agg.top_scores(top_k),
+        'margin_min': lo - agg.margin_limit,
+        'margin_counts': agg.margin_hist[lo:hi].tolist(),
+        'quantiles': agg.quantiles(),
+    }
+    return payload
+
+
+def simulate_payload(sim, home, away, simulations=SLATE_SIMULATIONS, rng=None, chunk_size=1_000_000,
+                     dtype=np.float32, **overrides):
+    result = sim.simulate_match_streaming(home, away, simulations=simulations, chunk_size=chunk_size, dtype=dtype,
+                                          rng=rng, **overrides)
+    return result_payload(result) if result is not None else None
+
+
+def _scenarios(sim, home, away):
+    h_auto = bool(sim.get_team_stats(home).get('Is_B2B', False))
+    a_auto = bool(sim.get_team_stats(away).get('Is_B2B', False))
+    yield 'base', h_auto, a_auto, [], []
+    yield 'home_b2b_toggled', not h_auto, a_auto, [], []
+    yield 'away_b2b_toggled', h_auto, not a_auto, [], []
+    for side, team in (('home', home), ('away', away)):
+        roster = sim.get_roster(team)
+        if roster:
+            missing = [roster[0][0]]
+            yield f'{side}_top_out', h_auto, a_auto, missing if side == 'home' else [], \
+                missing if side == 'away' else []
+
+
+def build_slate(sim, games, date=None, simulations=SLATE_SIMULATIONS, seed=None):
+    date = date or datetime.date.today()
+    known = set(sim.get_all_teams())
+    games = [g for g in games if g[0] in known and g[1] in known]
+    seeds = np.random.SeedSequence(seed).spawn(len(games))
+
+    entries = []
+    for (home, away), ss in zip(games, seeds):
+        rng = np.random.default_rng(ss)
+        scenarios = {}
+        for name, h_b2b, a_b2b, h_miss, a_miss in _scenarios(sim, home, away):
+            payload = simulate_payload(sim, home, away, simulations, rng, override_home_b2b=h_b2b,
+                                       override_away_b2b=a_b2b, home_missing_players=h_miss,
+                                       away_missing_players=a_miss)
+            payload['scenario'] = name
+            scenarios[scenario_key(h_b2b, a_b2b, h_miss, a_miss)] = payload
+        entries.append({'home_team': home, 'away_team': away, 'scenarios': scenarios})
+
+    return {
+        'version': SLATE_VERSION,
+        'season': sim.season,
+        'date': date.isoformat(),
+        'created': datetime.datetime.now().isoformat(timespec='seconds'),
+        'data_sha1': file_sha1(sim.data_path),
+        'simulations': simulations,
+        'games': entries,
+    }
+
+
+def write_slate(slate, path):
+    with gzip.open(path, 'wt', encoding='utf-8') as f:
+        json.dump(slate, f, separators=(',', ':'))
+    return path
+
+
+class SlateArtifact:
+    def __init__(self, slate):
+        self.slate = slate
+        self.games = {(g['home_team'], g['away_team']): g['scenarios'] for g in slate['games']}
+
+    @classmethod
+    def load(cls, path, data_path=None):
+        # Artefakt başka bir veri dosyasından üretildiyse kullanılmaz
+        if not os.path.exists(path): return None
+        try:
+            with gzip.open(path, 'rt', encoding='utf-8') as f:
+                slate = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if slate.get('version') != SLATE_VERSION: return None
+        if data_path is not None and slate.get('data_sha1') != file_sha1(data_path): return None
+        return cls(slate)
+
+    def __contains__(self, game):
+        return tuple(game) in self.games
+
+    def matchups(self):
+        return list(self.games)
+
+    def lookup(self, sim, home, away, override_home_b2b=None, override_away_b2b=None,
+               home_missing_players=None, away_missing_players=None):
+        scenarios = self.games.get((home, away))
+        if scenarios is None: return None
+        h_b2b = override_home_b2b if override_home_b2b is not None else sim.get_team_stats(home).get('Is_B2B', False)
+        a_b2b = override_away_b2b if override_away_b2b is not None else sim.get_team_stats(away).get('Is_B2B', False)
+        payload = scenarios.get(scenario_key(h_b2b, a_b2b, home_missing_players, away_missing_players))
+        if payload is None: return None
+        return dict(payload, source='artifact')
+
+
+def serve_match(sim, artifact, home, away, simulations=SLATE_SIMULATIONS, rng=None, chunk_size=1_000_000,
+                dtype=np.float32, **overrides):
+    # Önce hazır artefakt, yoksa (özel senaryo) canlı simülasyon; iki kaynak da aynı alanları döndürür
+    if artifact is not None:
+        payload = artifact.lookup(sim, home, away, **overrides)
+        if payload is not None: return payload
+    payload = simulate_payload(sim, home, away, simulations, rng, chunk_size, dtype, **overrides)
+    if payload is not None:
+        payload.update(scenario=None, source='live')
+    return payload
+
+
+def build_daily_slate(season=DEFAULT_SEASON, data_path=None, fixtures_path=None, date=None,
+                      simulations=SLATE_SIMULATIONS, seed=None):
+    from src.monte_carlo import MonteCarloSimulator
+    data_path = data_path or master_data_path(season)
+    sim = MonteCarloSimulator(data_path=data_path, use_pandas=False, season=season)
+    date = date or datetime.date.today()
+    fixtures_path = fixtures_path or fixtures_path_for(data_path, season)
+    games = read_fixtures(fixtures_path, date) if os.path.exists(fixtures_path) else []
+    slate = build_slate(sim, games, date=date, simulations=simulations, seed=seed)
+    path = write_slate(slate, slate_path_for(data_path, season))
+    print(f"Günün maç artefaktı hazır: {len(slate['games'])} maç -> {path}", file=sys.stderr)
+    return path
+
+
+if __name__ == "__main__":
+    build_daily_slate(int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_SEASON)
@@ -0,0 +1,168 @@
+import numpy as np
+
+MARGIN_LIMIT = 100
+SCORE_LIMIT = 250
+QUANTILES = (0.01, 0.05, 0.25, 0.5, 0.75, 0.95, 0.99)
+
+
+class HistogramSketch:
+    # Fixed-width bins over [low, high) plus under/overflow bins; memory is constant and
+    # quantile error is bounded by bin_width inside the range.
+    def __init__(self, low, high, bin_width=0.05):
+        self.low = float(low)
+        self.bin_width = float(bin_width)
+        self.n_bins = int(np.ceil((high - low) / bin_width))
+        self.counts = np.zeros(self.n_bins + 2, dtype=np.int64)
+        self.min = np.inf
+        self.max = -np.inf
+
+    def update(self, values):
+        if values.size == 0: return
+        idx = np.floor((values - self.low) / self.bin_width).astype(np.int64) + 1
+        np.clip(idx, 0, self.n_bins + 1, out=idx)
+        self.counts += np.bincount(idx, minlength=self.n_bins + 2)
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+
+    @property
+    def total(self):
+        return int(self.counts.sum())
+
+    def quantile(self, q):
+        total = self.total
+        if total == 0: return float('nan')
+        cum = np.cumsum(self.counts)
+        target = q * total
+        i = int(np.searchsorted(cum, target, side='left'))
+        if i == 0: return self.min
+        if i == self.n_bins + 1: return self.max
+        frac = (target - cum[i - 1]) / self.counts[i] if self.counts[i] else 0.0
+        return float(self.low + (i - 1 + frac) * self.bin_width)
+
+
+class StreamingAggregator:
+    def __init__(self, margin_limit=MARGIN_LIMIT, score_limit=SCORE_LIMIT, bin_width=0.05):
+        self.margin_limit = margin_limit
+        self.score_limit = score_limit
+        self.n = 0
+        self.home_wins = 0
+        self.sum_home = 0.0
+        self.sum_away = 0.0
+        # Rounded outcomes; values outside the range are folded into the edge bins
+        self.margin_hist = np.zeros(2 * margin_limit + 1, dtype=np.int64)
+        self.joint_hist = np.zeros((score_limit + 1, score_limit + 1), dtype=np.int64)
+        self.sketches = {
+            'home': HistogramSketch(0, score_limit, bin_width),
+            'away': HistogramSketch(0, score_limit, bin_width),
+            'margin': HistogramSketch(-margin_limit, margin_limit, bin_width),
+            'total': HistogramSketch(0, 2 * score_limit, bin_width),
+        }
+
+    def update(self, h_sim, a_sim):
+        self.n += h_sim.size
+        self.home_wins += int(np.count_nonzero(h_sim > a_sim))
+        self.sum_home += float(h_sim.sum(dtype=np.float64))
+        self.sum_away += float(a_sim.sum(dtype=np.float64))
+
+        h_int = np.clip(np.rint(h_sim), 0, self.score_limit).astype(np.int64)
+        a_int = np.clip(np.rint(a_sim), 0, self.score_limit).astype(np.int64)
+        side = self.score_limit + 1
+        self.joint_hist += np.bincount(h_int * side + a_int, minlength=side * side).reshape(side, side)
+
+        m_idx = np.clip(h_int - a_int, -self.margin_limit, self.margin_limit) + self.margin_limit
+        self.margin_hist += np.bincount(m_idx, minlength=self.margin_hist.size)
+
+        margin = h_sim - a_sim
+        self.sketches['home'].update(h_sim)
+        self.sketches['away'].update(a_sim)
+        self.sketches['margin'].update(margin)
+        self.sketches['total'].update(h_sim + a_sim)
+
+    @property
+    def home_win_pct(self):
+        return (self.home_wins / self.n) * 100 if self.n else 0.0
+
+    def margin_values(self):
+        return np.arange(-self.margin_limit, self.margin_limit + 1)
+
+    def prob_margin_over(self, line):
+        # P(rounded home margin > line)
+        if not self.n: return float('nan')
+        return float(self.margin_hist[self.margin_values() > line].sum() / self.n)
+
+    def prob_margin_push(self, line):
+        # P(rounded home margin == line); zero for half-point lines
+        if not self.n: return float('nan')
+        if line != np.floor(line): return 0.0
+        return float(self.margin_hist[self.margin_values() == line].sum() / self.n)
+
+    def total_values(self):
+        return np.arange(0, 2 * self.score_limit + 1)
+
+    def total_hist(self):
+        side = self.score_limit + 1
+        totals = (np.arange(side)[:, None] + np.arange(side)[None, :]).ravel()
+        return np.bincount(totals, weights=self.joint_hist.ravel(), minlength=2 * side - 1).astype(np.int64)
+
+    def margin_survival(self, lines):
+        return _survival(self.margin_values(), self.margin_hist, self.n, lines)
+
+    def total_survival(self, lines):
+        return _survival(self.total_values(), self.total_hist(), self.n, lines)
+
+    def top_scores(self, k=10):
+        flat = self.joint_hist.ravel()
+        k = min(k, int(np.count_nonzero(flat)))
+        if k == 0: return []
+        idx = np.argpartition(flat, -k)[-k:]
+        idx = idx[np.argsort(flat[idx])[::-1]]
+        side = self.score_limit + 1
+        return [(int(i // side), int(i % side), int(flat[i])) for i in idx]
+
+    def quantiles(self, qs=QUANTILES):
+        return {name: {str(q): sk.quantile(q) for q in qs} for name, sk in self.sketches.items()}
+
+    def summary(self, top_k=10):
+        return {
+            'simulations': self.n,
+            'home_win_pct': self.home_win_pct,
+            'mean_home': self.sum_home / self.n if self.n else float('nan'),
+            'mean_away': self.sum_away / self.n if self.n else float('nan'),
+            'quantiles': self.quantiles(),
+            'top_scores': self.top_scores(top_k),
+        }
+
+
+def half_point(lines):
+    # Integer-valued X: X > x  <=>  X > floor(x) + 0.5, so every line maps onto a half-point line
+    return np.floor(lines) + 0.5
+
+
+def _survival(values, counts, n, lines):
+    # Strict P(X > line) for integer-valued X (step function between half-point lines)
+    if not n: return np.full(np.shape(lines), np.nan)
+    sf = counts[::-1].cumsum()[::-1] / n
+    return np.interp(half_point(lines), values - 0.5, sf, left=1.0, right=0.0)
+
+
+def stream_normal_pairs(h_mean, a_mean, sigma, simulations, chunk_size=1_000_000, dtype=np.float64,
+                        rng=None, aggregator=None):
+    rng = rng if rng is not None else np.random.default_rng()
+    agg = aggregator if aggregator is not None else StreamingAggregator()
+    dtype = np.dtype(dtype)
+    remaining = int(simulations)
+
+    while remaining > 0:
+        n = min(chunk_size, remaining)
+        if isinstance(rng, np.random.Generator):
+            z = rng.standard_normal((2, n), dtype=dtype)
+        else:
+            z = rng.standard_normal((2, n)).astype(dtype, copy=False)
+        z *= dtype.type(sigma)
+        z[0] += dtype.type(h_mean)
+        z[1] += dtype.type(a_mean)
+        agg.update(z[0], z[1])
+        del z
+        remaining -= n
+
+    return agg
@@ -0,0 +1,110 @@
+import csv
+import datetime
+import glob
+import os
+import re
+import sys
+
+import numpy as np
+
+
+def current_season(today=None):
+    # Sezon bitiş yılıyla anılır; Temmuz'dan itibaren bir sonraki sezona geçilir
+    today = today or datetime.date.today()
+    return today.year + (today.month >= 7)
+
+
+DEFAULT_SEASON = current_season()
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'raw')
+
+TEXT_COLUMNS = ['Team', 'Home', 'Road', 'Last_10', 'Streak', 'Top_Stars']
+BOOL_COLUMNS = ['Is_B2B']
+COLUMN_DEFAULTS = {'Is_B2B': False, 'Top_Stars': "", 'Off_3PAr': 0.40, 'Net_Rtg': 0.0}
+
+
+def master_data_path(season=DEFAULT_SEASON, data_dir=DATA_DIR):
+    return os.path.join(data_dir, f'nba_master_data_{season}.csv')
+
+
+def available_seasons(data_dir=DATA_DIR):
+    seasons = []
+    for path in glob.glob(os.path.join(data_dir, 'nba_master_data_*.csv')):
+        m = re.search(r'nba_master_data_(\d{4})\.csv$', path)
+        if m: seasons.append(int(m.group(1)))
+    return sorted(seasons)
+
+
+def _parse_value(col, raw):
+    raw = raw.strip() if raw is not None else ""
+    if col in BOOL_COLUMNS:
+        return raw.lower() in ('true', '1', 'yes')
+    if col in TEXT_COLUMNS:
+        return raw
+    if raw == "":
+        return float('nan')
+    try:
+        return float(raw)
+    except ValueError:
+        return raw
+
+
+def clean_records(records):
+    # load_data() ile aynı temizlik: boş/tekrarlı takımları at, eksik kolonları doldur, isme göre sırala
+    seen = {}
+    for rec in records:
+        team = str(rec.get('Team', '') or '').strip()
+        if not team or team in seen:
+            continue
+        rec = dict(rec)
+        rec['Team'] = team
+        for col, default in COLUMN_DEFAULTS.items():
+            if col not in rec:
+                rec[col] = default
+        seen[team] = rec
+    return [seen[t] for t in sorted(seen)]
+
+
+def load_team_records(csv_path):
+    if not os.path.exists(csv_path): return []
+    with open(csv_path, newline='', encoding='utf-8') as f:
+        reader = csv.DictReader(f)
+        records = [{col: _parse_value(col, val) for col, val in row.items()} for row in reader]
+    return clean_records(records)
+
+
+def snapshot_path_for(csv_path):
+    return os.path.splitext(csv_path)[0] + '.npz'
+
+
+def write_snapshot(records, path):
+    columns = list(records[0].keys()) if records else []
+    arrays = {}
+    for col in columns:
+        values = [r.get(col) for r in records]
+        if col in BOOL_COLUMNS:
+            arrays[col] = np.array(values, dtype=bool)
+        elif col in TEXT_COLUMNS or any(isinstance(v, str) for v in values):
+            arrays[col] = np.array(["" if v is None else str(v) for v in values])
+        else:
+            arrays[col] = np.array(values, dtype=np.float64)
+    np.savez(path, _columns=np.array(columns), **arrays)
+    return path
+
+
+def load_snapshot(path):
+    if not os.path.exists(path): return []
+    with np.load(path, allow_pickle=False) as z:
+        columns = z['_columns'].tolist()
+        data = {col: z[col].tolist() for col in columns}
+    n = len(data[columns[0]]) if columns else 0
+    return [{col: data[col][i] for col in columns} for i in range(n)]
+
+
+def build_snapshot(csv_path, path=None):
+    path = path or snapshot_path_for(csv_path)
+    return write_snapshot(load_team_records(csv_path), path)
+
+
+if __name__ == "__main__":
+    src = master_data_path(int(sys.argv[1])) if len(sys.argv) > 1 else master_data_path()
+    print(f"Snapshot yazıldı: {build_snapshot(src)}")